@@ -1,7 +1,7 @@
+from dataclasses import dataclass
 from typing import Tuple, Generator
 
 import numpy as np
-import pymunk
 
 from curling import constants as c
 from curling import utils
@@ -26,32 +26,47 @@ from curling import utils
 _HOUSE_RAIDUS = utils.dist(feet=6, inches=c.STONE_RADIUS_IN)
 
 
+@dataclass
+class BoardView:
+    """Named, zero-copy views over the rows of a board array.
+
+    Each field already lives in its own contiguous row of the 6x16 board,
+    so structure-of-arrays access is just a matter of naming the rows:
+    writes through a view mutate the underlying board.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    thrown: np.ndarray
+    in_play: np.ndarray
+    distance: np.ndarray
+    scoring: np.ndarray
+
+    @classmethod
+    def of(cls, board: np.ndarray) -> 'BoardView':
+        return cls(x=board[c.BOARD_X], y=board[c.BOARD_Y],
+                   thrown=board[c.BOARD_THROWN], in_play=board[c.BOARD_IN_PLAY],
+                   distance=board[c.BOARD_DISTANCE], scoring=board[c.BOARD_SCORING])
+
+
 def update_distance_and_score(board: np.array):
-    for stone in board.T:
-        xy = pymunk.Vec2d(stone[c.BOARD_X], stone[c.BOARD_Y])
-        stone[c.BOARD_DISTANCE] = utils.euclid(xy, c.BUTTON_POSITION)
+    view = BoardView.of(board)
+    view.distance[:] = np.hypot(view.x - c.BUTTON_POSITION.x,
+                                view.y - c.BUTTON_POSITION.y)
 
-    shot_stones = np.argsort(board[c.BOARD_DISTANCE])
+    shot_stones = np.argsort(view.distance)[:8]
 
+    # Only the leading run of stones from the closest team can score.
     if shot_stones[0] < 8:
-        team_range = range(0, 8)
+        team_mask = shot_stones < 8
     else:
-        team_range = range(8, 16)
-
-    board[c.BOARD_SCORING].fill(c.NOT_SCORING)
-    for i in range(8):
-        stone_id = shot_stones[i]
-        if stone_id not in team_range:
-            break
-        stone = board[:, stone_id]
-        if stone[c.BOARD_THROWN] and stone[c.BOARD_IN_PLAY]:
-            stone[c.BOARD_SCORING] = c.SCORING
-
+        team_mask = shot_stones >= 8
+    if not team_mask.all():
+        shot_stones = shot_stones[:np.argmin(team_mask)]
 
-def get_stones_in_play(board: np.array):
-    for stone in board.T:
-        if stone[c.BOARD_IN_PLAY] == c.IN_PLAY and stone[c.BOARD_THROWN] == c.THROWN:
-            yield stone
+    view.scoring.fill(c.NOT_SCORING)
+    scoring = (view.thrown[shot_stones] == c.THROWN) & \
+              (view.in_play[shot_stones] == c.IN_PLAY)
+    view.scoring[shot_stones[scoring]] = c.SCORING
 
 
 def stones_for_team(board: np.array, team: int):
@@ -77,22 +92,31 @@ def get_xy_team2(board: np.array) -> Generator[Tuple[float, float], None, None]:
             yield board[c.BOARD_X][i], board[c.BOARD_Y][i]
 
 
+def boardKey(board: np.array) -> bytes:
+    """Compact cache key: positions quantized to 2 decimals, as raw bytes.
+
+    One vectorized multiply+cast, unlike stringRepresentation which formats
+    every float. int32 because y-coordinates run to ~1600 inches, so the
+    scaled values overflow int16.
+    """
+    return np.round(board * 100).astype(np.int32).tobytes()
+
+
 def get_data_rows(board: np.array) -> np.array:
     return board[c.BOARD_Y + 1:]  # everything except x and y rows
 
 
 def getInitBoard():
-    board = np.zeros(getBoardSize(), float)
+    # float32 is plenty for inch-scale coordinates and halves the bytes
+    # moved by every copy, cache key and serialization of the board.
+    board = np.zeros(getBoardSize(), np.float32)
     # x values. p1...p1, p2...p2
     # y values
     # 0,1 - has this stone been thrown yet
     # 0,1 - is this stone "in play" (1) or "out of play" (0) (touched a wall)
-    board[c.BOARD_X].fill(0)
-    board[c.BOARD_Y].fill(0)
-    board[c.BOARD_THROWN].fill(c.NOT_THROWN)
+    # np.zeros already covers x/y, NOT_THROWN, distance and NOT_SCORING;
+    # only the in-play row needs a non-zero initial value.
     board[c.BOARD_IN_PLAY].fill(c.IN_PLAY)
-    board[c.BOARD_DISTANCE].fill(0)
-    board[c.BOARD_SCORING].fill(c.NOT_SCORING)
     return board
 
 
@@ -101,14 +125,9 @@ def getBoardSize():
 
 
 def getBoardRepr(board):
-    ret = "\n"
-    ret += str(list(map(int, board[0]))) + "\n"
-    ret += str(list(map(int, board[1]))) + "\n"
-    ret += str(list(map(int, board[2]))) + "\n"
-    ret += str(list(map(int, board[3]))) + "\n"
-    ret += str(list(map(int, board[4]))) + "\n"
-    ret += str(list(map(int, board[5])))
-    return ret
+    # One vectorized cast instead of six Python map() passes.
+    rows = board.astype(np.int64).tolist()
+    return "\n" + "\n".join(str(row) for row in rows)
 
 
 def thrownStones(board):
@@ -0,0 +1,59 @@
+import collections
+
+
+class FastLFU:
+    """O(1) least-frequently-used cache.
+
+    Keys are grouped into frequency buckets (a dict of insertion-ordered
+    dicts), so lookup, insert and eviction are all constant time. Ties
+    within a bucket are broken least-recently-used first.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._values = {}
+        self._key_freq = {}
+        self._freq = collections.defaultdict(collections.OrderedDict)
+        self._min_freq = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        if key not in self._values:
+            return default
+        self._touch(key)
+        return self._values[key]
+
+    def set(self, key, value):
+        if key in self._values:
+            self._values[key] = value
+            self._touch(key)
+            return
+        if len(self._values) >= self.max_size:
+            self._evict()
+        self._values[key] = value
+        self._key_freq[key] = 1
+        self._freq[1][key] = None
+        self._min_freq = 1
+
+    def _touch(self, key):
+        freq = self._key_freq[key]
+        del self._freq[freq][key]
+        if not self._freq[freq]:
+            del self._freq[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._key_freq[key] = freq + 1
+        self._freq[freq + 1][key] = None
+
+    def _evict(self):
+        victim = next(iter(self._freq[self._min_freq]))
+        del self._freq[self._min_freq][victim]
+        if not self._freq[self._min_freq]:
+            del self._freq[self._min_freq]
+        del self._values[victim]
+        del self._key_freq[victim]
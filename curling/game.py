@@ -1,10 +1,12 @@
-import json
+import functools
+import itertools
 import logging
 
-import memoization as mem
 import numpy as np
+import orjson
 
 from curling import board as board_utils
+from curling import cache
 from curling import constants as c
 from curling import simulation
 from curling import utils
@@ -13,6 +15,8 @@ log = logging.getLogger(__name__)
 
 _TIED_SCORE = 0.00001
 
+_MISS = object()
+
 
 class GameException(Exception):
     """Logic within game is broken."""
@@ -22,11 +26,12 @@ class CurlingGame:
 
     def __init__(self):
         self.sim = simulation.Simulation()
-        self.caches = []
-        for _ in range(16):
-            new_cache = mem.cached(algorithm=mem.LFU, max_size=len(c.ACTION_LIST) ** 2,
-                                   custom_key_maker=self._custom_keys)(self.getNextState)
-            self.caches.append(new_cache)
+        self.cache = cache.FastLFU(max_size=len(c.ACTION_LIST) ** 2)
+        self._ended_cache = cache.FastLFU(max_size=8192)
+
+        # Validity depends only on the static action list: handle and broom
+        # must not both be positive or both be negative.
+        self._valid_actions = [0 if h * b > 0 else 1 for h, _, b in c.ACTION_LIST]
 
     @classmethod
     def getBoardSize(cls):
@@ -39,25 +44,37 @@ class CurlingGame:
     def getActionSize(self):
         return len(c.ACTION_LIST)
 
-    def _custom_keys(self, board, player, action, use_cache=True):
-        log.debug('_custom_keys called')
-        log.debug('%s, %s, %s', board, player, action)
-        return np.array2string(board, precision=5), player, action
+    def _custom_keys(self, board, player, action):
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('_custom_keys called')
+            log.debug('%s, %s, %s', board, player, action)
+        return board_utils.boardKey(board), player, action
 
     def getNextState(self, board, player, action, use_cache=True):
-        log.debug(f'getNextState({self.stringRepresentation(board)}, {player}, {action}={utils.decodeAction(action)})')
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f'getNextState({self.stringRepresentation(board)}, {player}, {action}={utils.decodeAction(action)})')
 
         if use_cache:
-            cache_idx = len(list(board_utils.get_stones_in_play(board)))
-            log.debug(f"Using cache[{cache_idx}]")
-            flip = player == c.P2
+            if player == c.P2:
+                # Results are stored in both orientations, so a repeat P2
+                # call returns without any canonical form round-trip.
+                key = self._custom_keys(board, player, action)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
             canon = self.getCanonicalForm(board, player)
-            cache = self.caches[cache_idx]
-            next_board, next_player = cache(canon, c.P1, action, use_cache=False)
-            if flip:
-                next_board = self.getCanonicalForm(next_board, c.P2)
-                next_player = c.P1
-            return next_board, next_player
+            canon_key = self._custom_keys(canon, c.P1, action)
+            cached = self.cache.get(canon_key)
+            if cached is None:
+                cached = self.getNextState(canon, c.P1, action, use_cache=False)
+                self.cache.set(canon_key, cached)
+            next_board, next_player = cached
+
+            if player == c.P2:
+                cached = self.getCanonicalForm(next_board, c.P2), c.P1
+                self.cache.set(key, cached)
+            return cached
 
         self.sim.setupBoard(board)
 
@@ -68,6 +85,9 @@ class CurlingGame:
         assert totalThrownStones_before + 1 == self.sim.space.thrownStonesCount(), f"Thrown stone count didn't increase correctly. before: {totalThrownStones_before}. now: {self.sim.space.thrownStonesCount()}"
 
         next_board = self.sim.getBoard()
+        # Remember what the space now holds so a follow-up move from this
+        # position can skip setupBoard entirely.
+        self.sim._board_key = next_board.tobytes()
         next_player = -player
 
         if self.sim.space.thrownStonesCount() < 16:
@@ -78,14 +98,16 @@ class CurlingGame:
         return next_board, next_player
 
     def getValidMoves(self, board, player):
-        log.debug(f'Board for player({player}):')
-        log.debug(board_utils.getBoardRepr(board))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Board for player(%s):', player)
+            log.debug(board_utils.getBoardRepr(board))
         board, player = self.getCanonicalForm(board, player), 1
-        log.debug(f'Canonicalized for player({player}):')
-        log.debug(board_utils.getBoardRepr(board))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Canonicalized for player(%s):', player)
+            log.debug(board_utils.getBoardRepr(board))
 
         if board_utils.thrownStones(board) >= 16:
-            log.error('Board: strRepr' + self.stringRepresentation(board))
+            log.error('Board: strRepr %s', self.stringRepresentation(board))
             raise GameException('getValidMoves requested after game end.')
 
         player_turn = utils.getNextPlayer(board, player)
@@ -93,12 +115,7 @@ class CurlingGame:
         # Since we got canonical board player_turn should always be 1
         assert player_turn == player, f'Moves requested for player ({player}) do not match next player ({player_turn})'
 
-        all_actions = [1] * self.getActionSize()
-
-        for action in range(self.getActionSize()):
-            h, w, b = utils.decodeAction(action)
-            if h * b > 0:  # clever hack to check that handle and broom not both positive or both negative.
-                all_actions[action] = 0
+        all_actions = list(self._valid_actions)
 
         if sum(all_actions) == 0:
             log.error('Entered a bad state: no valid moves.')
@@ -106,24 +123,31 @@ class CurlingGame:
         return all_actions
 
     def getGameEnded(self, board: np.array, player: int):
+        key = (board_utils.boardKey(board), player)
+        cached = self._ended_cache.get(key, _MISS)
+        if cached is not _MISS:
+            return cached
 
         # Convert everything to first-player perspective
         board = self.getCanonicalForm(board, player)
 
-        log.debug(f'getGameEnded({board})')
+        log.debug('getGameEnded(%s)', board)
         thrown_stones = board_utils.thrownStones(board)
         if thrown_stones < 16:
             log.debug('getGameEnded (thrown = %s) -> 0', thrown_stones)
-            return 0
-
-        p1_score = np.sum(board[c.BOARD_SCORING][0:8])
-        p2_score = np.sum(board[c.BOARD_SCORING][8:16])
-        if p1_score == p2_score:
-            return _TIED_SCORE
-        if p1_score > p2_score:
-            return p1_score
+            result = 0
         else:
-            return -1 * p2_score
+            p1_score = np.sum(board[c.BOARD_SCORING][0:8])
+            p2_score = np.sum(board[c.BOARD_SCORING][8:16])
+            if p1_score == p2_score:
+                result = _TIED_SCORE
+            elif p1_score > p2_score:
+                result = p1_score
+            else:
+                result = -1 * p2_score
+
+        self._ended_cache.set(key, result)
+        return result
 
     @staticmethod
     def getCanonicalForm(board, player):
@@ -131,41 +155,26 @@ class CurlingGame:
 
     @staticmethod
     def getSymmetries(board: np.array, pi):
-        all_symmetries = [(board, pi)]
-        CurlingGame._permuate_symmetries(all_symmetries, board, pi, 0, 8)
-        CurlingGame._permuate_symmetries(all_symmetries, board, pi, 8, 16)
+        perms = _symmetry_perms(board[c.BOARD_THROWN].tobytes(),
+                                board[c.BOARD_IN_PLAY].tobytes(),
+                                board.dtype.str)
 
-        for i in range(len(all_symmetries)):
-            s_board, _ = all_symmetries[i]
-            flip = s_board.copy()
-            flip[c.BOARD_X] *= -1  # vertical symmetry over center line
-            all_symmetries.append((flip, pi))
-        return all_symmetries
+        # One gather for all permutations, one buffer for all the X-flips,
+        # instead of a fresh board allocation per symmetry.
+        boards = board[:, perms].transpose(1, 0, 2)
+        flips = boards.copy()
+        flips[:, c.BOARD_X, :] *= -1  # vertical symmetry over center line
 
-    @staticmethod
-    def _permuate_symmetries(all_symmetries, board, pi, start, stop):
-        log.debug('Permuating symmetries!')
-        for i in range(start, stop):
-            stone1 = board[:, i]
-            if stone1[c.BOARD_THROWN] == c.NOT_THROWN:
-                break
-            for i2 in range(i + 1, stop):
-                stone2 = board[:, i2]
-                if stone2[c.BOARD_THROWN] == c.NOT_THROWN:
-                    break
-                if stone1[c.BOARD_IN_PLAY] == c.OUT_OF_PLAY and stone2[c.BOARD_IN_PLAY] == c.OUT_OF_PLAY:
-                    continue
-                swap = board.copy()
-                swap[:, [i, i2]] = swap[:, [i2, i]]
-                all_symmetries.append((swap, pi))
+        return [(s_board, pi) for s_board in boards] + [(flip, pi) for flip in flips]
 
     @staticmethod
     def stringRepresentation(board: np.array):
-        return json.dumps(np.around(board, decimals=2).tolist())
+        # Returns bytes; decode only when a human-readable str is needed.
+        return orjson.dumps(np.around(board, decimals=2), option=orjson.OPT_SERIALIZE_NUMPY)
 
     @classmethod
     def boardFromString(cls, string: str):
-        return np.array(json.loads(string))
+        return np.array(orjson.loads(string), dtype=np.float32)
 
     @classmethod
     def boardFromSchema(cls, data: dict):
@@ -192,7 +201,7 @@ class CurlingGame:
 
         board_utils.update_distance_and_score(board)
         str_repr = cls.stringRepresentation(board)
-        log.debug('Back to string: %s' % str_repr)
+        log.debug('Back to string: %s', str_repr)
         return board
 
     @classmethod
@@ -216,6 +225,36 @@ class CurlingGame:
         print(" -----------------------")
 
 
+@functools.lru_cache(maxsize=4096)
+def _symmetry_perms(thrown_bytes: bytes, in_play_bytes: bytes, dtype: str) -> np.ndarray:
+    """Stack of column permutations (identity first) for a board state.
+
+    Swappable stone pairs depend only on the thrown and in-play rows, so
+    the table is memoized on their raw bytes and revisited states skip the
+    pair enumeration entirely.
+    """
+    thrown = np.frombuffer(thrown_bytes, dtype=dtype)
+    in_play = np.frombuffer(in_play_bytes, dtype=dtype)
+    # Column indices are 0..15, so int8 keeps the memoized tables small.
+    perms = [np.arange(len(thrown), dtype=np.int8)]
+    _collect_swap_perms(perms, thrown, in_play, 0, 8)
+    _collect_swap_perms(perms, thrown, in_play, 8, 16)
+    return np.stack(perms)
+
+
+def _collect_swap_perms(perms, thrown, in_play, start, stop):
+    log.debug('Permuating symmetries!')
+    prefix = thrown[start:stop] == c.THROWN
+    n_thrown = stop - start if prefix.all() else int(np.argmin(prefix))
+    base = np.arange(len(thrown), dtype=np.int8)
+    for i, i2 in itertools.combinations(range(start, start + n_thrown), 2):
+        if in_play[i] == c.OUT_OF_PLAY and in_play[i2] == c.OUT_OF_PLAY:
+            continue
+        perm = base.copy()
+        perm[i], perm[i2] = i2, i
+        perms.append(perm)
+
+
 def _get_board_stone_id(schema_stone):
     """Converts schema-provided stone to a board stone id (sid)."""
     if schema_stone['color'] == c.P1_COLOR:
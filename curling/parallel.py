@@ -0,0 +1,44 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# One game (and therefore one pymunk space) per worker process, created by
+# the pool initializer. Process-level parallelism sidesteps the GIL, which
+# a thread pool around the Python-heavy simulation code cannot.
+#
+# This is also deliberately the only layer of parallelism: splitting the
+# per-stone physics inside one tick was considered and rejected, since with
+# at most 16 stones the fan-out/join overhead exceeds the work being split.
+# Whole simulations are the right grain — they are independent, seconds of
+# simulated time each, and scale with worker count.
+_worker_game = None
+
+
+def _init_worker():
+    global _worker_game
+    from curling import game
+    _worker_game = game.CurlingGame()
+
+
+def _next_state(args):
+    board, player, action = args
+    return _worker_game.getNextState(board, player, action)
+
+
+class CurlingGamePool:
+    """Runs independent getNextState rollouts across worker processes."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def getNextStateBatch(self, boards, players, actions) -> List[Tuple[np.ndarray, int]]:
+        log.debug('Dispatching %s rollouts to %s workers', len(actions), self.workers)
+        return list(self._pool.map(_next_state, zip(boards, players, actions)))
+
+    def close(self):
+        self._pool.shutdown()
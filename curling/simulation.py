@@ -53,8 +53,9 @@ def getNextStoneOrderId(board) -> int:
 class Simulation:
 
     def __init__(self):
-        space = utils.Space(threaded=True)
-        space.threads = 2
+        # Not threaded: with 16 stones the pymunk worker threads cost more
+        # in contention than they save; scale out with curling.parallel.
+        space = utils.Space()
         space.gravity = 0, 0
         space.damping = 1  # No slow down percentage
 
@@ -62,8 +63,21 @@ class Simulation:
 
         self.space = space
 
-        self.space.thrown_stones = [c.NOT_THROWN] * 16
-        self.space.inplay_stones = [c.IN_PLAY] * 16
+        self.space.thrown_stones = np.full(16, c.NOT_THROWN, dtype=np.float32)
+        self.space.inplay_stones = np.full(16, c.IN_PLAY, dtype=np.float32)
+
+        # Preallocated stones, recycled by addStone/resetBoard so each
+        # simulation doesn't malloc/free 16 pymunk bodies.
+        self._stone_pool = {
+            c.P1_COLOR: [utils.newStone(c.P1_COLOR) for _ in range(8)],
+            c.P2_COLOR: [utils.newStone(c.P2_COLOR) for _ in range(8)],
+        }
+        self.space.stone_pool = self._stone_pool
+
+        # Raw bytes of the board the space currently represents, or None
+        # whenever the space is mutated directly. Lets setupBoard() skip
+        # tearing down and rebuilding an identical state.
+        self._board_key = None
 
         self.resetBoard()
         self.board_before_action = self.getBoard()
@@ -75,64 +89,81 @@ class Simulation:
         board[c.BOARD_IN_PLAY] = self.space.inplay_stones
 
         log.debug('Populating board from sim.')
-        for stone in self.getStones():
-            log.debug('Setting board stone %s', stone)
-            if stone.color == c.P1_COLOR:
-                stone_id = stone.id
-            else:
-                stone_id = stone.id + 8
-
-            x, y = stone.getXY()
-            board[c.BOARD_X][stone_id] = x
-            board[c.BOARD_Y][stone_id] = y
-            board[c.BOARD_THROWN][stone_id] = c.THROWN
-            board[c.BOARD_IN_PLAY][stone_id] = c.IN_PLAY
+        stones = self.getStones()
+        if stones:
+            ids = np.array([s.id if s.color == c.P1_COLOR else s.id + 8 for s in stones])
+            board[c.BOARD_X][ids] = [s.body.position.x for s in stones]
+            board[c.BOARD_Y][ids] = [s.body.position.y for s in stones]
+            board[c.BOARD_THROWN][ids] = c.THROWN
+            board[c.BOARD_IN_PLAY][ids] = c.IN_PLAY
 
         board_utils.update_distance_and_score(board)
         return board
 
     def setupBoard(self, new_board):
+        board_key = new_board.tobytes()
+        if board_key == self._board_key:
+            log.debug('setupBoard() skipped: board already loaded.')
+            # The stone that produced this board is no longer the shooter;
+            # without this the next setupAction would add a second one.
+            self.space.clear_shooter()
+            # Match the rebuilt state exactly: guard flags were computed
+            # at each stone's position before the last throw, and stones
+            # settle with sub-threshold drift the rebuild would zero.
+            for stone in self.space.get_stones():
+                stone.updateGuardValue()
+                stone.body.velocity = utils.ZERO_VECTOR
+                stone.body.angular_velocity = 0
+            return
         new_board = new_board.copy()
-        log.debug(f'setupBoard({board_utils.getBoardRepr(new_board)})')
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('setupBoard(%s)', board_utils.getBoardRepr(new_board))
         self.resetBoard()
 
-        p1_stones = board_utils.stones_for_team(new_board, c.P1)
-        for i, (x, y, thrown, in_play, *_) in enumerate(p1_stones):
-            if thrown and in_play:
-                self.addStone(c.P1_COLOR, x, y, stone_id=i)
-
-        p2_stones = board_utils.stones_for_team(new_board, c.P2)
-        for i, (x, y, thrown, in_play, *_) in enumerate(p2_stones):
-            if thrown and in_play:
-                self.addStone(c.P2_COLOR, x, y, stone_id=i)
+        on_sheet = (new_board[c.BOARD_THROWN] == c.THROWN) & (new_board[c.BOARD_IN_PLAY] == c.IN_PLAY)
+        xs = new_board[c.BOARD_X]
+        ys = new_board[c.BOARD_Y]
+        for i in np.nonzero(on_sheet)[0]:
+            color = c.P1_COLOR if i < 8 else c.P2_COLOR
+            self.addStone(color, xs[i], ys[i], stone_id=int(i) % 8)
 
         # TODO: Convert all p1/p2_removed_stones to single array. maybe
         self.space.thrown_stones = new_board[c.BOARD_THROWN]
         self.space.inplay_stones = new_board[c.BOARD_IN_PLAY]
+        self._board_key = board_key
 
     def resetBoard(self):
+        self._board_key = None
         for stone in self.getStones():
             self.space.remove(stone.body, stone)
-        self.space.thrown_stones = [c.NOT_THROWN] * 16
-        self.space.inplay_stones = [c.IN_PLAY] * 16
+            self._stone_pool[stone.color].append(stone)
+        self.space.thrown_stones = np.full(16, c.NOT_THROWN, dtype=np.float32)
+        self.space.inplay_stones = np.full(16, c.IN_PLAY, dtype=np.float32)
 
     def getStones(self) -> List[utils.Stone]:
         # keeping it a list (not an iterator) on purpose
-        return [s for s in self.space.shapes if type(s) == utils.Stone]
+        return self.space.get_stones()
 
     def getShooterStone(self):
-        for stone in self.getStones():
-            if stone.is_shooter:
-                return stone
-
-        log.debug('')
-        log.debug(self.getBoard())
-        log.debug('')
-        raise ShooterNotFound()
+        try:
+            return self.space.get_shooter()
+        except utils.ShooterNotInGame:
+            log.debug('')
+            log.debug(self.getBoard())
+            log.debug('')
+            raise ShooterNotFound()
 
     def addStone(self, color: str, x, y, action=None, stone_id=None):
-        stone = utils.newStone(color)
+        pool = self._stone_pool[color]
+        if pool:
+            stone = pool.pop()
+            stone.is_shooter = False
+            stone.is_guard = False
+            stone.already_removed = False
+        else:
+            stone = utils.newStone(color)
         board = self.getBoard()
+        self._board_key = None
         if stone_id is None:
             stone_id = getNextStoneId(board)
         stone.id = stone_id
@@ -146,13 +177,13 @@ class Simulation:
             stone.body.velocity = utils.calculateVelocityVector(weight, broom)
             stone.is_shooter = True
 
-            log.debug(f'Setting HWB: {handle, weight, broom}')
-            log.debug(f'Velocity: {stone.body.velocity}')
+            log.debug('Setting HWB: %s', (handle, weight, broom))
+            log.debug('Velocity: %s', stone.body.velocity)
         else:
             stone.body.angular_velocity = 0
             stone.body.velocity = utils.ZERO_VECTOR
 
-        log.debug("+ %s" % stone)
+        log.debug("+ %s", stone)
         self.space.add(stone.body, stone)
 
         data_position = stone_id if color == c.P1_COLOR else stone_id + 8
@@ -161,7 +192,7 @@ class Simulation:
         return stone
 
     def setupAction(self, player, action):
-        log.debug(f'setupAction({player}, {action})')
+        log.debug('setupAction(%s, %s)', player, action)
         self.board_before_action = self.getBoard()
         color = utils.getPlayerColor(player)
         self.addStone(color, 0, 0, action)
@@ -179,26 +210,32 @@ class Simulation:
 
         self.space.thrown_stones[data_position] = c.THROWN
         self.space.inplay_stones[data_position] = c.OUT_OF_PLAY
+        self._board_key = None
 
     def run(self, deltaTime=c.DT):
+        log.debug('run starting...')
+        space = self.space
+        step = space.step
+        any_moving = space.any_moving
         more_changes = True
         sim_time = 0
-        log.debug('run starting...')
         while more_changes:
-            self.space.step(deltaTime)
+            step(deltaTime)
 
-            if self.space.five_rock_rule_violation:
+            if space.five_rock_rule_violation:
                 # TODO: Move this logic to game.getNextState()
                 log.debug('Warning: 5 rock rule violated. Resetting the board!')
                 self.setupBoard(self.board_before_action)
                 self.addShooterAsInvalid()
-                self.space.five_rock_rule_violation = False
+                space.five_rock_rule_violation = False
                 break
 
             sim_time += deltaTime
             if sim_time > 60:
                 log.error('Simulation running for more than 60 seconds.')
                 raise Timeout()
-            more_changes = any(s.moving() for s in self.space.get_stones())
 
-        log.debug('run() complete with stones: %s and data: %s', self.getStones(), self.getBoard())
+            more_changes = any_moving()
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('run() complete with stones: %s and data: %s', self.getStones(), self.getBoard())
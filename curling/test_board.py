@@ -4,6 +4,15 @@ from curling import board
 from curling import constants as c
 
 
+def test_board_view_is_zero_copy():
+  b = board.getInitBoard()
+  view = board.BoardView.of(b)
+
+  view.thrown[0] = c.THROWN
+
+  assert b[c.BOARD_THROWN][0] == c.THROWN
+
+
 def test_update_distance_and_score():
   b = board.getInitBoard()
   board.set_stone(b, c.P1, 0, c.BUTTON_POSITION.x + 1, c.BUTTON_POSITION.y + 1)
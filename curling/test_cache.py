@@ -0,0 +1,49 @@
+from curling import cache
+
+
+def test_get_miss_returns_default():
+    lfu = cache.FastLFU(max_size=2)
+    assert lfu.get('missing') is None
+    assert lfu.get('missing', 42) == 42
+
+
+def test_set_and_get():
+    lfu = cache.FastLFU(max_size=2)
+    lfu.set('a', 1)
+    assert lfu.get('a') == 1
+    assert 'a' in lfu
+    assert len(lfu) == 1
+
+
+def test_eviction_drops_least_frequent():
+    lfu = cache.FastLFU(max_size=2)
+    lfu.set('a', 1)
+    lfu.set('b', 2)
+    lfu.get('a')
+
+    lfu.set('c', 3)
+
+    assert 'a' in lfu
+    assert 'b' not in lfu
+    assert 'c' in lfu
+
+
+def test_eviction_lru_tiebreak():
+    lfu = cache.FastLFU(max_size=2)
+    lfu.set('a', 1)
+    lfu.set('b', 2)
+    lfu.get('a')
+    lfu.get('b')
+
+    lfu.set('c', 3)
+
+    assert 'a' not in lfu
+    assert 'b' in lfu
+
+
+def test_overwrite_existing_key():
+    lfu = cache.FastLFU(max_size=2)
+    lfu.set('a', 1)
+    lfu.set('a', 2)
+    assert lfu.get('a') == 2
+    assert len(lfu) == 1
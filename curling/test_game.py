@@ -258,6 +258,34 @@ def test_string_repr_is_symmetric():
     np.testing.assert_array_equal(board_setup, board_check)
 
 
+def test_getNextState_follow_up_move():
+    # A follow-up move from the returned board hits the setupBoard() skip
+    # path; the previous shooter must be demoted, not left in the space.
+    curl = game.CurlingGame()
+    board = curl.getInitBoard()
+
+    next_board, next_player = curl.getNextState(board, c.P1, c.ACTION_LIST.index((1, '3', 5)), use_cache=False)
+    next_board, _ = curl.getNextState(next_board, next_player, c.ACTION_LIST.index((-1, '3', -5)), use_cache=False)
+
+    assert board_utils.thrownStones(next_board) == 2
+
+
+def test_getNextState_follow_up_takeout():
+    # The skip path must also refresh guard flags: the drawn stone rests
+    # past the tee (not a guard), so taking it out is legal and must not
+    # trip the five-rock rule the way a stale launch-point flag would.
+    curl = game.CurlingGame()
+    board = curl.getInitBoard()
+
+    next_board, next_player = curl.getNextState(board, c.P1, c.ACTION_LIST.index((-1, '7', 0)), use_cache=False)
+    assert next_board[c.BOARD_Y][0] > utils.TEE_LINE
+
+    next_board, _ = curl.getNextState(next_board, next_player, c.ACTION_LIST.index((-1, 'control', -6)), use_cache=False)
+
+    assert board_utils.thrownStones(next_board) == 2
+    assert next_board[c.BOARD_IN_PLAY][0] == c.OUT_OF_PLAY
+
+
 def test_getNextState_is_cached():
     curl = game.CurlingGame()
     board = curl.getInitBoard()
@@ -0,0 +1,23 @@
+import numpy as np
+
+from curling import constants as c
+from curling import game
+from curling import parallel
+
+
+def test_getNextStateBatch_matches_serial():
+    curl = game.CurlingGame()
+    board = curl.getInitBoard()
+    actions = [c.ACTION_LIST.index((-1, '3', 5)), c.ACTION_LIST.index((1, '3', -5))]
+
+    pool = parallel.CurlingGamePool(workers=2)
+    try:
+        results = pool.getNextStateBatch([board, board], [c.P1, c.P1], actions)
+    finally:
+        pool.close()
+
+    assert len(results) == 2
+    for action, (next_board, next_player) in zip(actions, results):
+        expected_board, expected_player = curl.getNextState(board, c.P1, action)
+        np.testing.assert_array_almost_equal(next_board, expected_board)
+        assert next_player == expected_player
@@ -35,6 +35,11 @@ TEE_LINE = HOG_LINE + dist(feet=21)
 
 BOX_LENGTH_WITH_BUFFER = BOX_LENGTH + BACKLINE_BUFFER
 
+# Guard-zone geometry. Keeps updateGuardValue's historical line positions,
+# which differ slightly from HOG_LINE/TEE_LINE above.
+_GUARD_TEE_LINE = STONE_RADIUS + dist(feet=6 + 6 + 21 + 72 + 21)
+_GUARD_HOUSE_R2 = (dist(feet=6) + STONE_RADIUS) ** 2
+
 # For conversion between Board and Real
 X_SCALE = (ICE_WIDTH - 2.0 * STONE_RADIUS + 1) / ICE_WIDTH  # Don't know why +1 but makes the tests pass.
 Y_SCALE = (BOX_LENGTH_WITH_BUFFER - (2.0 * STONE_RADIUS) + 1) / BOX_LENGTH_WITH_BUFFER
@@ -65,27 +70,69 @@ class Space(pymunk.Space):
 
         self.shooter_color = 'Unknown'
 
+        # Kept in sync by add()/remove() so stone queries don't rescan shapes.
+        self._stones = []
+        self._shooter = None
+
+        # Optional free-list set by the owning Simulation; removed stones
+        # are parked there for reuse instead of being garbage collected.
+        self.stone_pool = None
+
+    def add(self, *objs):
+        super().add(*objs)
+        for obj in objs:
+            if obj.__class__ is Stone:
+                self._stones.append(obj)
+                if obj.is_shooter:
+                    if self._shooter is not None and self._shooter is not obj:
+                        raise GameException('Found 2 shooter stones. Expected 1 or 0.')
+                    self._shooter = obj
+
+    def remove(self, *objs):
+        super().remove(*objs)
+        for obj in objs:
+            # Removals during step() are deferred and replayed by pymunk,
+            # so the same stone can come through here twice.
+            if obj.__class__ is Stone and obj in self._stones:
+                self._stones.remove(obj)
+                if obj is self._shooter:
+                    self._shooter = None
+
     def get_stones(self) -> List['Stone']:
-        return [s for s in self.shapes if type(s) == Stone]
+        return list(self._stones)
+
+    def any_moving(self, thresh=0.01) -> bool:
+        """True if any stone's velocity exceeds thresh on either axis.
+
+        The single "are we done?" poll for the simulation loop, so the
+        velocity unpack and compare stay inline rather than going through
+        a per-stone helper call.
+        """
+        for stone in self._stones:
+            vx, vy = stone.body.velocity
+            if not -thresh < vx < thresh or not -thresh < vy < thresh:
+                return True
+        return False
 
     def thrownStonesCount(self):
-        return sum(self.thrown_stones)
+        return int(np.sum(self.thrown_stones))
 
     def get_shooter(self):
-        shooters = [s for s in self.get_stones() if s.is_shooter]
-
-        if len(shooters) == 1:
-            return shooters[0]
-        if len(shooters) == 0:
+        if self._shooter is None:
             raise ShooterNotInGame()
+        return self._shooter
 
-        raise GameException("Found %s shooter stones. Expected 1 or 0." % len(shooters))
+    def clear_shooter(self):
+        """Demote the current shooter, if any, to a regular stone."""
+        if self._shooter is not None:
+            self._shooter.is_shooter = False
+            self._shooter = None
 
     def get_shooter_color(self):
         return self.shooter_color
 
     def remove_stone(self, stone, reason=''):
-        log.debug(f'- {stone} {reason}')
+        log.debug('- %s %s', stone, reason)
         team = stone.getTeamId()
         if team == c.P1:
             self.inplay_stones[stone.id] = c.OUT_OF_PLAY
@@ -93,6 +140,8 @@ class Space(pymunk.Space):
             self.inplay_stones[stone.id + 8] = c.OUT_OF_PLAY
 
         self.remove(stone, stone.body)
+        if self.stone_pool is not None:
+            self.stone_pool[stone.color].append(stone)
 
 
 class Stone(pymunk.Circle):
@@ -111,7 +160,6 @@ class Stone(pymunk.Circle):
         self.color = 'unknown'
 
     def __repr__(self):
-        self.updateGuardValue()
         guard = ' guard' if self.is_guard and not self.moving() else ''
         moving = ' moving' if self.moving() else ''
         return (
@@ -128,17 +176,12 @@ class Stone(pymunk.Circle):
         return ret
 
     def updateGuardValue(self):
-        radius = STONE_RADIUS
-        hog_line = radius + dist(feet=6 + 6 + 21 + 72)
-        tee_line = hog_line + dist(feet=21)
-        from_pin = euclid(self.body.position, pymunk.Vec2d(0, tee_line))
-
+        # Compare squared distances to the pin: no sqrt, no Vec2d.
+        x = self.body.position.x
         y = self.body.position.y
+        dy = y - _GUARD_TEE_LINE
 
-        before_tee = y < tee_line
-        not_in_house = from_pin > dist(feet=6) + STONE_RADIUS
-
-        self.is_guard = before_tee and not_in_house
+        self.is_guard = y < _GUARD_TEE_LINE and x * x + dy * dy > _GUARD_HOUSE_R2
 
     def getTeamId(self):
         return c.P1 if self.color == c.P1_COLOR else c.P2
@@ -149,16 +192,31 @@ class Stone(pymunk.Circle):
     def getAngle(self):
         return self.body.angle
 
-def realToBoard(x: float, y: float) -> (int, int):
+def realToBoard(x, y):
+    """Identity since the board went to real-world inches.
+
+    Kept for API compatibility; works element-wise on scalars or arrays,
+    so batch conversions need no per-stone Python loop.
+    """
     return x, y
 
 
-def boardToReal(x: float, y: float):
+def boardToReal(x, y):
+    """Identity since the board went to real-world inches. See realToBoard."""
     return x, y
 
 
+_ACTION_INDEX = {}
+_ACTION_INDEX_SOURCE = None
+
+
 def getAction(handle: int, weight: str, broom: int):
-    return c.ACTION_LIST.index((int(handle), weight, int(broom)))
+    global _ACTION_INDEX, _ACTION_INDEX_SOURCE
+    if _ACTION_INDEX_SOURCE is not c.ACTION_LIST:
+        # Rebuilt whenever ACTION_LIST is swapped out (e.g. patched in tests).
+        _ACTION_INDEX = {action: i for i, action in enumerate(c.ACTION_LIST)}
+        _ACTION_INDEX_SOURCE = c.ACTION_LIST
+    return _ACTION_INDEX[(int(handle), weight, int(broom))]
 
 
 def decodeAction(action: int) -> Tuple[int, str, int]:
@@ -167,8 +225,14 @@ def decodeAction(action: int) -> Tuple[int, str, int]:
     return c.ACTION_LIST[action]
 
 
+_WEIGHT_DIST = {}
+
+
 def weight_to_dist(w):
-    return dist(feet=c.WEIGHT_FT[w.lower()])
+    w = w.lower()
+    if w not in _WEIGHT_DIST:
+        _WEIGHT_DIST[w] = dist(feet=c.WEIGHT_FT[w])
+    return _WEIGHT_DIST[w]
 
 
 def toFt(x):
@@ -179,65 +243,99 @@ def getPlayerColor(player):
     return c.P1_COLOR if player == 1 else c.P2_COLOR
 
 
-def stone_velocity(body, gravity, damping, dt):
-    F_normal = body.mass * dist(meters=c.G_FORCE)
-    F_fr = c.SURFACE_FRICTION * F_normal
+# Friction deceleration, precomputed once: surface friction * g in inches.
+_FRICTION_ACCEL = c.SURFACE_FRICTION * dist(meters=c.G_FORCE)
+
+
+def _stone_velocity_core(vx, vy, avel, mass):
+    """Total force on a stone as plain floats.
+
+    Pure scalar math on purpose: pymunk calls this for every body on every
+    tick, and the Vec2d operator chain it replaces allocated half a dozen
+    wrapper objects per call. Also the shape a JIT could compile directly.
+    """
+    speed = math.hypot(vx, vy)
+    if speed == 0:
+        return 0.0, 0.0
+
+    k = -mass * _FRICTION_ACCEL * min(speed, 1.0) / speed
+    fx = vx * k
+    fy = vy * k
+
+    if avel >= 0.01 or avel <= -0.01:
+        # Branchless +/-90 degree rotation: copysign picks the curl side
+        # without a data-dependent branch on the handle direction.
+        sign = math.copysign(1.0, avel)
+        curl = _curl_from_speed(speed) / speed
+        fx += sign * vy * curl
+        fy -= sign * vx * curl
+    return fx, fy
 
-    mult = min(body.velocity.length, 1)
-    body.force = body.velocity.normalized() * (F_fr * -1 * mult)
 
-    F_curl = getCurlingForce(body)
-    body.force -= F_curl
+def stone_velocity(body, gravity, damping, dt):
+    # body attribute reads go through pymunk's cffi wrappers, so each is
+    # read once into a local for the whole tick.
+    vx, vy = body.velocity
+    avel = body.angular_velocity
+    body.force = _stone_velocity_core(vx, vy, avel, body.mass)
 
     # TODO: It appears that the following block has no effect
-    direction = 1 if body.angular_velocity > 0 else -1
-    angular_damping = 0.001
-    if abs(body.angular_velocity) > angular_damping:
-        body.angular_velocity -= angular_damping * direction
+    if avel > 0.001:
+        body.angular_velocity = avel - 0.001
+    elif avel < -0.001:
+        body.angular_velocity = avel + 0.001
     else:
         body.angular_velocity = 0
 
     pymunk.Body.update_velocity(body, gravity, damping, dt)
 
 
+_VEL_CACHE = {}
+
+
 def calculateVelocityVector(weight: str, broom: int):
-    F_normal = c.STONE_MASS * dist(meters=c.G_FORCE)
-    F_fr = c.SURFACE_FRICTION * F_normal
+    # Deterministic in (weight, broom), so computed once per combination.
+    cached = _VEL_CACHE.get((weight, broom))
+    if cached is None:
+        F_normal = c.STONE_MASS * dist(meters=c.G_FORCE)
+        F_fr = c.SURFACE_FRICTION * F_normal
 
-    work = weight_to_dist(weight) * F_fr  # W = d*F
-    vel = math.sqrt(2.0 * work / c.STONE_MASS)  # W = v^2 * m * 1/2
+        work = weight_to_dist(weight) * F_fr  # W = d*F
+        vel = math.sqrt(2.0 * work / c.STONE_MASS)  # W = v^2 * m * 1/2
 
-    x = dist(feet=broom)
-    y = weight_to_dist(weight)
-    # TODO: Optimize by setting length instead of normalizing + multiplying
-    direction = pymunk.Vec2d(x, y)
-    direction.normalize_return_length()
-    return direction * vel
+        x = dist(feet=broom)
+        y = weight_to_dist(weight)
+        # TODO: Optimize by setting length instead of normalizing + multiplying
+        direction = pymunk.Vec2d(x, y)
+        direction.normalize_return_length()
+        velocity = direction * vel
+        cached = _VEL_CACHE[(weight, broom)] = (velocity.x, velocity.y)
+    return pymunk.Vec2d(*cached)
 
 
 ZERO_VECTOR = pymunk.Vec2d(0, 0)
 
 
+# Wall endpoints, fixed at module load. Side walls sit at +/-ICE_WIDTH/2
+# (looks like they should be offset by 1 radius but tests say otherwise);
+# the back wall sits at BACKLINE_ELIM because stones are removed once they
+# fully exit the actual backline.
+_BOUNDARY_WALLS = (
+    ('Left wall', (-ICE_WIDTH / 2, 0), (-ICE_WIDTH / 2, BACKLINE_ELIM)),
+    ('Backline wall', (-ICE_WIDTH / 2, BACKLINE_ELIM), (ICE_WIDTH / 2, BACKLINE_ELIM)),
+    ('Right wall', (ICE_WIDTH / 2, BACKLINE_ELIM), (ICE_WIDTH / 2, 0)),
+)
+
+
 def addBoundaries(space: Space):
     log.info('Adding boundaries to space')
-    left = -ICE_WIDTH / 2  # I think it should be offset by 1 radius but tests say otherwise
-    right = ICE_WIDTH / 2
-    # stones are removed when they exit the actual backline.
-    backline = BACKLINE_ELIM
-    log.debug(f'Boundaries (left, right, backline) = {left, right, backline}')
-
-    w1, w2, w3 = (
-        pymunk.Segment(space.static_body, (left, 0), (left, backline), 0.1),
-        pymunk.Segment(space.static_body, (left, backline), (right, backline), 0.1),
-        pymunk.Segment(space.static_body, (right, backline), (right, 0), 0.1)
-    )
-    w1.name = 'Left wall'
-    w2.name = 'Right wall'
-    w3.name = 'Backline wall'
-
-    w1.collision_type = 2
-    w2.collision_type = 2
-    w3.collision_type = 2
+
+    walls = []
+    for name, a, b in _BOUNDARY_WALLS:
+        wall = pymunk.Segment(space.static_body, a, b, 0.1)
+        wall.name = name
+        wall.collision_type = 2
+        walls.append(wall)
 
     def remove_stone(arbiter, local_space, data):
         stone, wall = arbiter.shapes
@@ -256,13 +354,7 @@ def addBoundaries(space: Space):
 
     space.add_collision_handler(1, 2).begin = remove_stone
 
-    space.add(w1, w2, w3)
-
-
-def still_moving(shape):
-    vx = abs(shape.body.velocity.x) > 0.001
-    vy = abs(shape.body.velocity.y) > 0.001
-    return vx or vy
+    space.add(*walls)
 
 
 def newStone(color: str):
@@ -283,43 +375,45 @@ def sqGauss(x: float, m: float = 1, o: float = 0, em: float = 1, eo: float = 0)
     return (x * m + o) * math.exp(-(math.pow(x, 2) * em + eo))
 
 
-def getCurlingForce(body:pymunk.Body) -> pymunk.Vec2d:
-    # numbers not the same as index.ts because this is now Force not Velocity.
+def _curl_from_speed(speed: float) -> float:
+    """sqGauss specialized to the curl constants, with the /25 folded in.
 
-    speed = body.velocity.length / 25
+    Runs per stone per tick, so the generic function's default-argument
+    dispatch and pow() call are replaced by one multiply chain and exp.
+    """
+    x = speed * 0.04  # speed / 25
+    return 1300.0 * x * math.exp(-(x * x * 0.2 + 1.5))
 
-    curlFromSpeed = sqGauss(speed, 1300, 0, 0.2, 1.5)
 
-    curl_effect = 1
-    if abs(body.angular_velocity) < 0.01:
-        curl_effect = 0
-
-    direction = -90 if body.angular_velocity < 0 else 90
-    curlVector = body.velocity.normalized() * (curlFromSpeed * curl_effect)
-    curlVector.rotate_degrees(direction)
-
-    # print(f"speed={speed} curl={curlFromSpeed} effect={curl_effect} vec={curlVector.length}")
-
-    return curlVector
+def getCurlingForce(body: pymunk.Body) -> pymunk.Vec2d:
+    # numbers not the same as index.ts because this is now Force not Velocity.
+    # Raw-float math throughout: normalized()/rotate_degrees() allocated a
+    # Vec2d per step; here only the returned vector is constructed.
+    vx, vy = body.velocity
+    avel = body.angular_velocity
+    speed = math.hypot(vx, vy)
 
+    if speed == 0 or -0.01 < avel < 0.01:
+        # Fresh vector on purpose: Vec2d is mutable and ZERO_VECTOR is
+        # shared (it seeds stone velocities), so handing it out would let
+        # callers corrupt it.
+        return pymunk.Vec2d(0, 0)
 
-def euclid(v1, v2):
-    return math.sqrt(((v1.x - v2.x) ** 2) + ((v1.y - v2.y) ** 2))
+    sign = math.copysign(1.0, avel)
+    curl = _curl_from_speed(speed) / speed
+    return pymunk.Vec2d(-sign * vy * curl, sign * vx * curl)  # rotated +/-90 degrees
 
 
 def five_rock_rule(stone, space: Space):
-    total_stones = space.thrownStonesCount()
-    if total_stones > 5:
-        return False
-
-    log.debug('Checking 5 rock rule: stone color vs shooter color: %s, %s', stone.color, space.get_shooter_color())
-    if stone.color == space.get_shooter_color():
+    # Runs inside the wall-collision callback; checks ordered cheapest
+    # first so most stones bail on the guard flag before any counting.
+    if not stone.is_guard:
         return False
 
-    if not stone.is_guard:
+    if stone.color == space.shooter_color:
         return False
 
-    return True
+    return space.thrownStonesCount() <= 5
 
 
 def getNextPlayer(board, player):
@@ -328,12 +422,14 @@ def getNextPlayer(board, player):
     thrown_data = board[c.BOARD_THROWN]
     log.debug('Checking data: %s', thrown_data)
 
-    for i in range(8):  # Check 8 stones
-        if thrown_data[i] == c.NOT_THROWN:
-            return 1 * player
+    p1_waiting = thrown_data[0:8] == c.NOT_THROWN
+    p2_waiting = thrown_data[8:16] == c.NOT_THROWN
+    next_p1 = int(p1_waiting.argmax()) if p1_waiting.any() else 8
+    next_p2 = int(p2_waiting.argmax()) if p2_waiting.any() else 8
 
-        if thrown_data[i + 8] == c.NOT_THROWN:
-            return -1 * player
+    if next_p1 < 8 or next_p2 < 8:
+        # P1 throws on ties, matching the old stone-by-stone scan.
+        return 1 * player if next_p1 <= next_p2 else -1 * player
 
     log.error("Nobody's turn")
     log.error(f'Player: {player}')
@@ -357,4 +453,13 @@ def getData(board: np.ndarray):
 
 
 def getStoneLocations(board: np.ndarray) -> (List[int], List[int]):
-    return np.argwhere(board == c.P1), np.argwhere(board == c.P2)
+    """(x, y) coordinates of thrown, in-play stones, one array per team.
+
+    The 6x16 board already is the compact stone-list representation, so
+    this reads the position rows directly instead of scanning a raster.
+    """
+    on_sheet = (board[c.BOARD_THROWN] == c.THROWN) & (board[c.BOARD_IN_PLAY] == c.IN_PLAY)
+    xy = board[c.BOARD_X:c.BOARD_Y + 1]
+    team1 = xy[:, :8][:, on_sheet[:8]].T
+    team2 = xy[:, 8:][:, on_sheet[8:]].T
+    return team1, team2